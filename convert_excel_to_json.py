@@ -1,21 +1,230 @@
-import pandas as pd
+from openpyxl import load_workbook
+from itertools import repeat
+from operator import itemgetter
 import json
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+def _write_json(data, path):
+    """Write data as 2-space indented JSON.
+
+    orjson serializes to a single bytes buffer when available; otherwise the
+    stdlib encoder's chunks are streamed to the file so the full document is
+    never held as one str.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(data))
+
+def _file_signature(paths):
+    """Return a string of the mtime and size of each path, or None if any is missing."""
+    try:
+        stats = [os.stat(path) for path in paths]
+    except OSError:
+        return None
+    return ' '.join(f"{st.st_mtime_ns}:{st.st_size}" for st in stats)
+
+def _open_first_sheet(input_file):
+    """Open the first sheet of input_file and return (header, iter_data_rows, close).
+
+    iter_data_rows(max_col) yields the cell values of each row after the
+    header. python-calamine parses the workbook natively when available and
+    returns full-width rows; otherwise the sheet is streamed with openpyxl in
+    read-only mode, reading each row only up to column max_col (padded with
+    None where the row is shorter).
+    """
+    if CalamineWorkbook is not None:
+        rows = CalamineWorkbook.from_path(input_file).get_sheet_by_index(0).iter_rows()
+        return next(rows, []), lambda max_col: rows, lambda: None
+
+    wb = load_workbook(input_file, read_only=True, data_only=True)
+    ws = wb.worksheets[0]
+    # Ignore the stored <dimension>, which some writers leave stale (e.g.
+    # "A1") and which would otherwise truncate every row to that range
+    ws.reset_dimensions()
+    header = next(ws.iter_rows(max_row=1, values_only=True), ())
+
+    def iter_data_rows(max_col):
+        return ws.iter_rows(min_row=2, max_col=max_col, values_only=True)
+
+    return header, iter_data_rows, wb.close
+
+def _convert_cell(value):
+    """Normalise a cell value the way pandas' Excel readers do.
+
+    Empty cells become empty strings and integral floats (calamine returns
+    every number as a float) become ints, so both readers give the same JSON.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _iter_rows(sheet_rows, positions):
+    """Yield the cells at positions for each remaining row of sheet_rows.
+
+    Cells are normalised with _convert_cell. As with pandas, only trailing
+    rows that are empty in every column read are dropped; other rows are kept
+    even when the required cells are blank. (The openpyxl reader stops at the
+    last required column, so a trailing row with data only beyond it counts
+    as empty.)
+    """
+    pick = itemgetter(*positions)
+    empty_cells = ('',) * len(positions)
+    pending_empty_rows = 0
+    for row in sheet_rows:
+        # Hold back empty rows until a later row shows they are not trailing
+        if row.count(None) + row.count('') == len(row):
+            pending_empty_rows += 1
+            continue
+        if pending_empty_rows:
+            yield from repeat(empty_cells, pending_empty_rows)
+            pending_empty_rows = 0
+
+        yield tuple(map(_convert_cell, pick(row)))
+
+def _build_hierarchy(rows):
+    """Build the L1 -> L2 -> L3 tree in a single pass over rows.
+
+    Nodes are looked up by name so a row that revisits an earlier L1/L2 still
+    lands under it, preserving first-appearance order without grouping.
+    """
+    hierarchy_data = {"name": "Process Hierarchy", "children": []}
+
+    # Each L1 name maps to its node and a lookup of its own L2 nodes, so
+    # rows resolve their parents with plain name lookups instead of
+    # hashing a composite (L1, L2) key
+    l1_nodes = {}
+    cur_l1 = None
+    cur_l2 = None
+
+    for l1_name, l2_name, l3, obj, uc, itr in rows:
+        # Parents only need resolving at a group boundary; consecutive rows
+        # of the same L2 append straight to the current node
+        if l2_name != cur_l2 or l1_name != cur_l1:
+            l1_entry = l1_nodes.get(l1_name)
+            if l1_entry is None:
+                l1_node = {
+                    "name": l1_name,
+                    "level": "L1",
+                    "children": []
+                }
+                hierarchy_data["children"].append(l1_node)
+                l1_entry = l1_nodes[l1_name] = (l1_node, {})
+            l1_node, l2_nodes = l1_entry
+
+            l2_node = l2_nodes.get(l2_name)
+            if l2_node is None:
+                l2_node = l2_nodes[l2_name] = {
+                    "name": l2_name,
+                    "level": "L2",
+                    "children": []
+                }
+                l1_node["children"].append(l2_node)
+
+            cur_l1 = l1_name
+            cur_l2 = l2_name
+
+        l2_node["children"].append({
+            "name": l3,
+            "level": "L3",
+            "objective": obj,
+            "use_case": uc,
+            "it_release": itr
+        })
+
+    return hierarchy_data
+
+def _build_search_index(hierarchy_data):
+    """Flatten the hierarchy into a search index in hierarchical order.
+
+    L1 entries are followed by their L2 children, which are followed by their
+    L3 children. An L2 name is only listed under the first L1 it appears in.
+    """
+    search_index = []
+    seen_l2 = set()
+
+    for l1_node in hierarchy_data["children"]:
+        l1_name = l1_node["name"]
+        search_index.append({
+            "name": l1_name,
+            "level": "L1",
+            "parent": "",
+            "details": {}
+        })
+
+        for l2_node in l1_node["children"]:
+            l2_name = l2_node["name"]
+            if l2_name not in seen_l2:
+                search_index.append({
+                    "name": l2_name,
+                    "level": "L2",
+                    "parent": l1_name,
+                    "details": {}
+                })
+                seen_l2.add(l2_name)
+
+            for l3_node in l2_node["children"]:
+                search_index.append({
+                    "name": l3_node["name"],
+                    "level": "L3",
+                    "parent": l2_name,
+                    "details": {
+                        "objective": l3_node["objective"],
+                        "use_case": l3_node["use_case"],
+                        "it_release": l3_node["it_release"]
+                    }
+                })
+
+    return search_index
+
 def convert_excel_to_json():
     input_file = 'SCE AMI - Process Hierarchy.xlsx'
     hierarchy_output = 'hierarchy-data.json'
     search_output = 'search-index.json'
+    cache_file = '.cache_key'
 
     if not os.path.exists(input_file):
         print(f"Error: {input_file} not found.")
         return
 
+    # Skip the conversion when the workbook, this script and both outputs are
+    # unchanged since the last run, so converter changes and edited or
+    # checked-out outputs still trigger a rebuild
+    cache_paths = [input_file, os.path.abspath(__file__), hierarchy_output, search_output]
     try:
-        df = pd.read_excel(input_file)
-        
-        # Clean column names - strip whitespace
-        df.columns = df.columns.str.strip()
+        with open(cache_file, encoding='utf-8') as f:
+            cached_key = f.read()
+    except OSError:
+        cached_key = None
+
+    if cached_key is not None and cached_key == _file_signature(cache_paths):
+        print(f"{input_file} is unchanged; {hierarchy_output} and {search_output} are up to date")
+        return
+
+    try:
+        # Stream the first sheet rather than materialising a DataFrame
+        header, iter_data_rows, close_sheet = _open_first_sheet(input_file)
+
+        # Clean column names - strip whitespace - and record each name's
+        # position once (first occurrence wins for duplicated headers)
+        column_positions = {}
+        for i, col in enumerate(header):
+            if col is not None:
+                column_positions.setdefault(str(col).strip(), i)
         
         # Verify required columns exist
         required_columns = [
@@ -27,99 +236,27 @@ def convert_excel_to_json():
             'IT Release'
         ]
         
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in required_columns if col not in column_positions]
         if missing_columns:
+            close_sheet()
             print(f"Error: Missing columns in Excel file: {missing_columns}")
             return
 
-        # Fill NaN values with empty strings
-        df = df.fillna('')
+        positions = [column_positions[col] for col in required_columns]
 
-        # Build Hierarchy Data
-        hierarchy_data = {"name": "Process Hierarchy", "children": []}
-        
-        # Group by L1, preserving order (sort=False)
-        for l1_name, l1_group in df.groupby('L1 Process Name', sort=False):
-            l1_node = {
-                "name": l1_name,
-                "level": "L1",
-                "children": []
-            }
-            
-            # Group by L2 within L1, preserving order (sort=False)
-            for l2_name, l2_group in l1_group.groupby('L2 Process Name', sort=False):
-                l2_node = {
-                    "name": l2_name,
-                    "level": "L2",
-                    "children": []
-                }
-                
-                # Iterate L3 within L2 (already preserves row order)
-                for _, row in l2_group.iterrows():
-                    l3_node = {
-                        "name": row['L3 Process Name'],
-                        "level": "L3",
-                        "objective": row['L3 Process Objective'],
-                        "use_case": row['Use Case Mapping'],
-                        "it_release": row['IT Release']
-                    }
-                    l2_node["children"].append(l3_node)
-                
-                l1_node["children"].append(l2_node)
-            
-            hierarchy_data["children"].append(l1_node)
-
-        # Build Search Index (Flat list) - maintaining hierarchical order
-        # L1 entries should be followed by their L2 children, which should be followed by their L3 children
-        search_index = []
-        seen_l1 = set()
-        seen_l2 = set()
-        
-        # Group by L1, preserving order
-        for l1_name, l1_group in df.groupby('L1 Process Name', sort=False):
-            # Add L1 (only once per L1)
-            if l1_name not in seen_l1:
-                search_index.append({
-                    "name": l1_name,
-                    "level": "L1",
-                    "parent": "",
-                    "details": {}
-                })
-                seen_l1.add(l1_name)
-            
-            # Group by L2 within L1, preserving order
-            for l2_name, l2_group in l1_group.groupby('L2 Process Name', sort=False):
-                # Add L2 (only once per L2, immediately after its L1)
-                if l2_name not in seen_l2:
-                    search_index.append({
-                        "name": l2_name,
-                        "level": "L2",
-                        "parent": l1_name,
-                        "details": {}
-                    })
-                    seen_l2.add(l2_name)
-                
-                # Add all L3 entries for this L2 immediately after the L2 entry
-                for _, row in l2_group.iterrows():
-                    search_index.append({
-                        "name": row['L3 Process Name'],
-                        "level": "L3",
-                        "parent": l2_name,
-                        "details": {
-                            "objective": row['L3 Process Objective'],
-                            "use_case": row['Use Case Mapping'],
-                            "it_release": row['IT Release']
-                        }
-                    })
-        
-        unique_search_index = search_index
+        # Only cells up to the last required column are read
+        sheet_rows = iter_data_rows(max(positions) + 1)
+        hierarchy_data = _build_hierarchy(_iter_rows(sheet_rows, positions))
+        close_sheet()
+
+        unique_search_index = _build_search_index(hierarchy_data)
 
         # Save files
-        with open(hierarchy_output, 'w', encoding='utf-8') as f:
-            json.dump(hierarchy_data, f, indent=2)
-        
-        with open(search_output, 'w', encoding='utf-8') as f:
-            json.dump(unique_search_index, f, indent=2)
+        _write_json(hierarchy_data, hierarchy_output)
+        _write_json(unique_search_index, search_output)
+
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write(_file_signature(cache_paths))
 
         print(f"Successfully converted {input_file}")
         print(f"Created {hierarchy_output} and {search_output}")